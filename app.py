@@ -1,8 +1,8 @@
 import streamlit as st
-import tempfile
 import os
 import time
 import sys
+import uuid
 import traceback
 
 # Configuración de la página
@@ -35,7 +35,11 @@ def load_models():
         progress_bar.progress(25)
         
         from src.audio_processor import AudioProcessor
-        st.session_state.processor = AudioProcessor()
+        from src.workspace import get_workspace
+        # Una sola instancia por proceso, compartida por todas las sesiones
+        st.session_state.workspace = get_workspace()
+        st.session_state.workspace.cleanup_stale()
+        st.session_state.processor = AudioProcessor(st.session_state.workspace)
         
         status_text.text("Audio processor loaded")
         progress_bar.progress(50)
@@ -104,15 +108,22 @@ def main():
       help="Supports YouTube, Vimeo, and direct audio links"
     )
 
+  # Opciones avanzadas
+  with st.expander("Advanced"):
+    profile = st.checkbox(
+      "Profile this request",
+      help="Saves a flame-graph file (collapsed stacks) if the request is among the slowest"
+    )
+
   # Botón de análisis
   if st.button("Analyze Accent", type="primary"):
     if not url and not uploaded_file:
       st.warning("Please provide a URL or upload a file.")
       return
     
-    analyze_audio(url, uploaded_file)
+    analyze_audio(url, uploaded_file, profile)
 
-def analyze_audio(url, uploaded_file):
+def analyze_audio(url, uploaded_file, profile=False):
   """Función separada para analizar el audio"""
   
   # Progress tracking
@@ -120,47 +131,57 @@ def analyze_audio(url, uploaded_file):
   status_text = st.empty()
   
   try:
+    from src.pipeline import analyze_file
+    from src.profiling import profile_request
+
     # Obtener los modelos del session state
     processor = st.session_state.processor
     classifier = st.session_state.classifier
     
-    audio_path = None
-    
-    # Procesar input
-    if url:
-      status_text.text("Downloading audio from URL...")
-      progress_bar.progress(20)
-      
-      audio_path = processor.download_and_extract_audio(url)
-      status_text.text("Audio downloaded!")
-      progress_bar.progress(40)
-      
-    elif uploaded_file:
-      status_text.text("Processing uploaded file...")
-      progress_bar.progress(20)
-      
-      # Verificar tamaño
-      if uploaded_file.size > 200*1024*1024:  # 200MB
-        st.error("File too large. Please upload files smaller than 200MB.")
-        return
-      
-      # Crear archivo temporal
-      with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp:
-        tmp.write(uploaded_file.read())
-        tmp.flush()
-        audio_path = processor._process_audio(tmp.name)
-      
-      status_text.text("File processed!")
-      progress_bar.progress(40)
+    job_id = uuid.uuid4().hex
+    with profile_request(job_id, enabled=profile) as profile_info:
+      # Directorio único por análisis, eliminado al terminar o fallar
+      with st.session_state.workspace.job(job_id=job_id) as job:
+        raw_audio_path = None
+
+        # Procesar input
+        if url:
+          status_text.text("Downloading audio from URL...")
+          progress_bar.progress(20)
+
+          raw_audio_path = processor.download_audio(url, job)
+          status_text.text("Audio downloaded!")
+          progress_bar.progress(40)
+
+        elif uploaded_file:
+          status_text.text("Processing uploaded file...")
+          progress_bar.progress(20)
+
+          # Verificar tamaño
+          if uploaded_file.size > 200*1024*1024:  # 200MB
+            st.error("File too large. Please upload files smaller than 200MB.")
+            return
+
+          # Guardar la subida dentro del directorio del trabajo
+          raw_audio_path = job.temp_path("upload" + os.path.splitext(uploaded_file.name)[1])
+          with open(raw_audio_path, "wb") as tmp:
+            tmp.write(uploaded_file.read())
+
+          status_text.text("File processed!")
+          progress_bar.progress(40)
+
+        # Clasificar acento
+        status_text.text("Analyzing accent... Please wait...")
+        progress_bar.progress(60)
+
+        start_time = time.time()
+        # El control de admisión decide perfil y ventana antes de decodificar
+        results = analyze_file(processor, classifier, raw_audio_path, job)
+        end_time = time.time()
+
+    if profile:
+      results["metadata"]["profile_path"] = profile_info["profile_path"]
 
-    # Clasificar acento
-    status_text.text("Analyzing accent... Please wait...")
-    progress_bar.progress(60)
-    
-    start_time = time.time()
-    results = classifier.classify_accent(audio_path)
-    end_time = time.time()
-    
     progress_bar.progress(100)
     status_text.text(f"Analysis completed in {end_time - start_time:.1f} seconds!")
 
@@ -207,6 +228,20 @@ def display_results(results):
   # Explicación
   st.markdown("### Explanation")
   st.info(results['explanation'])
+
+  # Avisar si el análisis se degradó por falta de memoria
+  admission = results.get("metadata", {}).get("admission", {})
+  if admission.get("action") == "downgraded":
+    st.warning(
+      f"Server busy: analyzed the first {admission['max_seconds']:.0f} seconds "
+      f"with the {admission['profile']} profile."
+    )
+  
+  # Perfil guardado
+  if "profile_path" in results.get("metadata", {}):
+    profile_path = results["metadata"]["profile_path"]
+    st.caption(f"Profile saved to {profile_path}" if profile_path
+               else "Profile discarded (faster than the slowest kept profiles)")
   
   # Transcripción
   if results.get("transcription"):
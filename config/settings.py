@@ -23,3 +23,60 @@ MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 100MB
 
 # Logging
 LOG_LEVEL = "INFO"
+
+# Espacio de trabajo temporal
+WORKSPACE_DIR = Path(TEMP_DIR) / "accent_classifier"
+PROCESSED_AUDIO_QUOTA = 2 * 1024 * 1024 * 1024  # 2GB de audio procesado
+KEEP_PROCESSED_AUDIO = False  # Conservar solo si alimenta una caché
+STALE_JOB_AGE = 6 * 60 * 60  # 6 horas
+
+# Estimación de pitch (F0)
+PITCH_BACKEND = "fast_acf"  # "fast_acf" o "yin"
+PITCH_FMIN = 50
+PITCH_FMAX = 300
+PITCH_DECIMATION = 4  # 16kHz -> 4kHz, suficiente para F0 <= 300Hz
+PITCH_FRAME_STRIDE = 1  # >1 submuestrea frames para las estadísticas
+PITCH_ENERGY_RATIO = 0.1  # Frames por debajo de mean(rms) * ratio se omiten
+PITCH_VOICING_THRESHOLD = 0.45
+
+# Control de admisión y presupuesto de memoria
+MEMORY_BUDGET_MB = 2048  # Memoria total para trabajos concurrentes
+ADMISSION_QUEUE_TIMEOUT = 60  # Segundos en cola antes de degradar o rechazar
+MIN_ADMISSION_WINDOW = 30  # Ventana mínima de audio (segundos) al degradar
+DEFAULT_PROCESSING_PROFILE = "full"
+
+# memory_factor: bytes por byte de audio a SAMPLE_RATE (STFT, MFCC, Whisper...)
+# cpu_factor: segundos de CPU por segundo de audio
+PROCESSING_PROFILES = {
+    "full": {
+        "whisper_beam_size": 5,
+        "pitch_frame_stride": PITCH_FRAME_STRIDE,
+        "memory_factor": 12,
+        "cpu_factor": 0.5,
+    },
+    "light": {
+        "whisper_beam_size": 1,
+        "pitch_frame_stride": 4,
+        "memory_factor": 7,
+        "cpu_factor": 0.2,
+    },
+}
+
+# Ingesta desde directorio
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.webm', '.flac', '.ogg', '.mp4', '.mkv', '.mov')
+INGEST_INDEX_NAME = ".accent_index.json"
+INGEST_POLL_INTERVAL = 10  # segundos entre escaneos en modo watch
+INGEST_SETTLE_SECONDS = 2  # ignorar archivos modificados hace menos de esto
+INGEST_INDEX_FLUSH_EVERY = 50  # guardar el índice cada N archivos procesados
+
+# Escritura de resultados
+RESULTS_BUFFER_SIZE = 256  # registros en memoria antes de escribir
+RESULTS_FSYNC_EVERY = 8  # fsync cada N escrituras del buffer
+RESULTS_PARQUET_PART_ROWS = 100000  # publicar un part de Parquet cada N filas...
+RESULTS_PARQUET_PART_FLUSHES = 16  # ...o cada N escrituras del buffer
+
+# Perfilado por petición
+PROFILE_DIR = DATA_DIR / "profiles"
+PROFILE_MODE = "sample"  # "sample" (pila colapsada) o "deterministic" (cProfile)
+PROFILE_INTERVAL = 0.005  # segundos entre muestras (200Hz); subir en producción
+PROFILE_KEEP_SLOWEST = 20  # conservar los perfiles de las N peticiones más lentas
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compares pitch backends against YIN on a corpus of audio files
+"""
+import sys
+import os
+import time
+import click
+import librosa
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pitch import estimate_pitch, pitch_stats
+from config.settings import *
+
+# f0_range is max - min, so a single YIN outlier at a voicing edge dominates it;
+# it is reported but not held to the tolerance
+CHECKED_STATS = ('f0_mean', 'f0_std')
+
+def yin_voiced_stats(y, sr):
+    """YIN restricted to frames that pass the same energy gate"""
+    f0 = librosa.yin(y, fmin=PITCH_FMIN, fmax=PITCH_FMAX, sr=sr)
+    rms = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)[0][:len(f0)]
+    return pitch_stats(f0[:len(rms)][rms > np.mean(rms) * PITCH_ENERGY_RATIO])
+
+@click.command()
+@click.argument('corpus', default=str(SAMPLE_VIDEOS_DIR))
+@click.option('--backend', default=PITCH_BACKEND, help='Backend to compare against YIN')
+@click.option('--frame-stride', default=PITCH_FRAME_STRIDE, help='Frame subsampling for the backend')
+@click.option('--tolerance', default=5.0, help='Maximum allowed difference in Hz')
+def benchmark(corpus, backend, frame_stride, tolerance):
+    """Times each backend and reports summary stat differences"""
+
+    files = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(corpus)
+        for name in names if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+    if not files:
+        print(f"No audio files found in {corpus}")
+        sys.exit(1)
+
+    print(f"Pitch benchmark: {backend} vs yin ({len(files)} files)")
+    print("=" * 55)
+
+    yin_time = fast_time = 0.0
+    worst = 0.0
+    for path in files:
+        y, sr = librosa.load(path, sr=SAMPLE_RATE, duration=MAX_AUDIO_LENGTH)
+
+        start = time.perf_counter()
+        reference = pitch_stats(estimate_pitch(y, sr, backend='yin'))
+        yin_time += time.perf_counter() - start
+
+        kwargs = {'frame_stride': frame_stride} if backend == 'fast_acf' else {}
+        start = time.perf_counter()
+        candidate = pitch_stats(estimate_pitch(y, sr, backend=backend, **kwargs))
+        fast_time += time.perf_counter() - start
+
+        gated = yin_voiced_stats(y, sr)
+        diffs = {key: abs(candidate[key] - gated[key]) for key in candidate}
+        worst = max(worst, *(diffs[key] for key in CHECKED_STATS))
+
+        print(f"\n{os.path.basename(path)}")
+        for key in candidate:
+            print(f"  {key}: yin={reference[key]:.1f} yin(voiced)={gated[key]:.1f} "
+                  f"{backend}={candidate[key]:.1f} diff={diffs[key]:.1f}Hz")
+
+    speedup = yin_time / fast_time if fast_time > 0 else float('inf')
+    print("\n" + "=" * 55)
+    print(f"yin: {yin_time:.2f}s  {backend}: {fast_time:.2f}s  speedup: {speedup:.1f}x")
+    print(f"Worst mean/std difference vs yin(voiced): {worst:.1f}Hz (tolerance {tolerance}Hz)")
+
+    if worst > tolerance:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    benchmark()
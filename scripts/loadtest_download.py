@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Load test for the download path against a local, bandwidth-shaped media server
+"""
+import sys
+import os
+import json
+import math
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import click
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_processor import AudioProcessor
+from src.pipeline import analyze_file
+from config.settings import *
+
+# extension -> (ffmpeg audio args, needs a video stream, content type)
+MEDIA_FORMATS = {
+    'm4a': (['-c:a', 'aac', '-b:a', '128k'], False, 'audio/mp4'),
+    'mp3': (['-c:a', 'libmp3lame', '-b:a', '128k'], False, 'audio/mpeg'),
+    'webm': (['-c:a', 'libopus', '-b:a', '64k'], False, 'audio/webm'),
+    'wav': (['-c:a', 'pcm_s16le'], False, 'audio/wav'),
+    'mp4': (['-c:a', 'aac', '-b:a', '128k'], True, 'video/mp4'),
+}
+
+def generate_media(media_dir, durations, formats):
+    """Creates synthetic media files with ffmpeg, reusing ones that already exist"""
+    media_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for duration in durations:
+        for ext in formats:
+            audio_args, with_video, _ = MEDIA_FORMATS[ext]
+            path = media_dir / f"tone_{duration}s.{ext}"
+            if not path.exists():
+                cmd = ['ffmpeg', '-y', '-v', 'error',
+                       '-f', 'lavfi', '-i', f'sine=frequency=220:sample_rate=44100:duration={duration}']
+                if with_video:
+                    cmd += ['-f', 'lavfi', '-i', f'color=c=gray:size=320x240:rate=15:duration={duration}',
+                            '-c:v', 'libx264', '-preset', 'ultrafast']
+                cmd += audio_args + ['-ac', '2', str(path)]
+                subprocess.run(cmd, check=True)
+            files.append(path)
+    return files
+
+class ShapedHandler(SimpleHTTPRequestHandler):
+    """Static file handler with per-connection latency and bandwidth limits"""
+
+    latency = 0.0
+    bandwidth = 0  # bytes per second, 0 for unlimited
+    chunk_size = 64 * 1024
+
+    def guess_type(self, path):
+        ext = os.path.splitext(path)[1].lstrip('.')
+        return MEDIA_FORMATS[ext][2] if ext in MEDIA_FORMATS else super().guess_type(path)
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        f = self.send_head()
+        if f is None:
+            return
+        try:
+            start = time.perf_counter()
+            sent = 0
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+                sent += len(chunk)
+                if self.bandwidth:
+                    delay = sent / self.bandwidth - (time.perf_counter() - start)
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            # Clients such as yt-dlp's generic extractor hang up after sniffing headers
+            pass
+        finally:
+            f.close()
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(media_dir, latency, bandwidth):
+    handler = type('Handler', (ShapedHandler,), {'latency': latency, 'bandwidth': bandwidth})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=str(media_dir)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_request(processor, classifier, url, submitted):
+    """Downloads (and optionally classifies) one URL, returning stage timings"""
+    started = time.perf_counter()
+    timings = {'url': url, 'queue_seconds': started - submitted}
+    try:
+        with processor.workspace.job() as job:
+            raw_audio_path = processor.download_audio(url, job, timings=timings)
+            if classifier is not None:
+                analyze_start = time.perf_counter()
+                analyze_file(processor, classifier, raw_audio_path, job)
+                timings['analyze_seconds'] = time.perf_counter() - analyze_start
+    except Exception as e:
+        timings['error'] = str(e)
+    finished = time.perf_counter()
+    timings['service_seconds'] = finished - started
+    timings['e2e_seconds'] = finished - submitted
+    return timings
+
+def percentile(values, q):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+def summarize(records, wall_seconds):
+    ok = [r for r in records if 'error' not in r]
+    downloaded = sum(r.get('downloaded_bytes', 0) for r in ok)
+    per_request = [r['downloaded_bytes'] / r['download_seconds'] for r in ok
+                   if r.get('download_seconds') and r.get('downloaded_bytes')]
+
+    summary = {
+        'requests': len(records),
+        'errors': len(records) - len(ok),
+        'wall_seconds': round(wall_seconds, 2),
+        'aggregate_throughput_mb_s': round(downloaded / wall_seconds / 1e6, 2) if wall_seconds else 0,
+        'per_request_throughput_mb_s_p50': round(percentile(per_request, 50) / 1e6, 2),
+    }
+    stages = ['queue_seconds', 'download_seconds', 'convert_seconds', 'analyze_seconds', 'e2e_seconds']
+    for stage in stages:
+        values = [r[stage] for r in ok if stage in r]
+        if values:
+            summary[stage] = {f'p{q}': round(percentile(values, q), 3) for q in (50, 95, 99)}
+    return summary
+
+@click.command()
+@click.option('--durations', default='10,60,300', help='Comma-separated media durations (seconds)')
+@click.option('--formats', default=','.join(MEDIA_FORMATS), help='Comma-separated container formats')
+@click.option('--requests', 'num_requests', default=50, help='Total number of requests')
+@click.option('--concurrency', default=4, help='Worker threads driving the downloader')
+@click.option('--rate', default=0.0, help='Arrivals per second (0 submits everything at once)')
+@click.option('--bandwidth', default=0, help='Per-connection bandwidth limit in KB/s (0 = unlimited)')
+@click.option('--latency', default=0.0, help='Added latency before each response, in ms')
+@click.option('--full', is_flag=True, help='Run the full classification pipeline after downloading')
+@click.option('--media-dir', default=None, help='Reuse generated media from this directory')
+@click.option('--output', default=None, help='Write per-request timings and summary as JSON')
+def loadtest(durations, formats, num_requests, concurrency, rate, bandwidth, latency, full,
+             media_dir, output):
+    """Drives AudioProcessor.download_audio against synthetic local media"""
+
+    print("Download path load test")
+    print("=" * 55)
+
+    formats = [f.strip() for f in formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in MEDIA_FORMATS]
+    if unknown:
+        print(f"Unknown formats: {', '.join(unknown)}")
+        sys.exit(1)
+
+    cleanup = media_dir is None
+    media_dir = Path(media_dir or tempfile.mkdtemp(prefix='loadtest_media_'))
+    try:
+        print("Generating media with ffmpeg...")
+        files = generate_media(media_dir, [int(d) for d in durations.split(',')], formats)
+
+        server = start_server(media_dir, latency / 1000, bandwidth * 1024)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"Serving {len(files)} files at {base_url} "
+              f"(bandwidth {bandwidth or 'unlimited'} KB/s, latency {latency} ms)")
+
+        processor = AudioProcessor(quiet=True)
+        classifier = None
+        if full:
+            from src.accent_classifier import EnglishAccentClassifier
+            print("Loading classifier...")
+            classifier = EnglishAccentClassifier()
+
+        urls = [f"{base_url}/{files[i % len(files)].name}" for i in range(num_requests)]
+        print(f"Running {num_requests} requests at concurrency {concurrency}...")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = []
+            for i, url in enumerate(urls):
+                if rate > 0:
+                    delay = start + i / rate - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                futures.append(executor.submit(run_request, processor, classifier, url,
+                                               time.perf_counter()))
+            records = [future.result() for future in futures]
+        wall_seconds = time.perf_counter() - start
+        server.shutdown()
+    finally:
+        if cleanup:
+            shutil.rmtree(media_dir, ignore_errors=True)
+
+    summary = summarize(records, wall_seconds)
+    print("\n" + "=" * 55)
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{q}={v:.3f}s" for q, v in value.items())
+        print(f"{key}: {value}")
+
+    for record in records:
+        if 'error' in record:
+            print(f"\nFirst error ({record['url']}): {record['error']}")
+            break
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({'summary': summary, 'requests': records}, f, indent=2)
+        print(f"\nTimings saved to: {output}")
+
+if __name__ == '__main__':
+    loadtest()
@@ -7,16 +7,18 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 import os
 from config.settings import *
+from src.pitch import estimate_pitch, pitch_stats
 
 class EnglishAccentClassifier:
-    def __init__(self):
+    def __init__(self, pitch_backend=PITCH_BACKEND):
         self.whisper_model = WhisperModel(WHISPER_MODEL)
+        self.pitch_backend = pitch_backend
         self.accent_categories = [
             "American", "British", "Australian", "Canadian", 
             "Irish", "Scottish", "South African", "Indian", "Other"
         ]
         
-    def classify_accent(self, audio_path):
+    def classify_accent(self, audio_path, profile=DEFAULT_PROCESSING_PROFILE, metadata=None):
         """Classifies the English accent in the audio"""
         
         results = {
@@ -24,12 +26,16 @@ class EnglishAccentClassifier:
             "confidence_score": 0,
             "english_confidence": 0,
             "transcription": "",
-            "explanation": ""
+            "explanation": "",
+            "metadata": dict(metadata or {}, profile=profile)
         }
+        settings = PROCESSING_PROFILES[profile]
         
         try:
             # 1. Transcription and language detection
-            transcription_result = self._transcribe_with_language_detection(audio_path)
+            transcription_result = self._transcribe_with_language_detection(
+                audio_path, beam_size=settings["whisper_beam_size"]
+            )
             results["transcription"] = transcription_result["text"]
             
             # 2. Check if it's English
@@ -41,7 +47,9 @@ class EnglishAccentClassifier:
                 return results
             
             # 3. Extract acoustic features for accent classification
-            acoustic_features = self._extract_accent_features(audio_path)
+            acoustic_features = self._extract_accent_features(
+                audio_path, pitch_frame_stride=settings["pitch_frame_stride"]
+            )
             
             # 4. Linguistic analysis of the text
             linguistic_features = self._analyze_linguistic_patterns(results["transcription"])
@@ -61,9 +69,9 @@ class EnglishAccentClassifier:
             
         return results
     
-    def _transcribe_with_language_detection(self, audio_path):
+    def _transcribe_with_language_detection(self, audio_path, beam_size=5):
         """Transcribes and detects language"""
-        segments, info = self.whisper_model.transcribe(audio_path)
+        segments, info = self.whisper_model.transcribe(audio_path, beam_size=beam_size)
         text = " ".join([segment.text for segment in segments])
         result = {"text": text, "language": info.language}
         return result
@@ -92,7 +100,7 @@ class EnglishAccentClassifier:
         total_confidence = min(base_confidence + word_confidence, 1.0)
         return round(total_confidence, 2)
     
-    def _extract_accent_features(self, audio_path):
+    def _extract_accent_features(self, audio_path, pitch_frame_stride=PITCH_FRAME_STRIDE):
         """Extracts acoustic features for accent classification"""
         
         y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
@@ -101,12 +109,8 @@ class EnglishAccentClassifier:
         
         # Prosodic features (rhythm and intonation)
         # F0 (fundamental pitch)
-        f0 = librosa.yin(y, fmin=50, fmax=300)
-        f0_clean = f0[f0 > 0]
-        
-        features['f0_mean'] = float(np.mean(f0_clean)) if len(f0_clean) > 0 else 0
-        features['f0_std'] = float(np.std(f0_clean)) if len(f0_clean) > 0 else 0
-        features['f0_range'] = float(np.max(f0_clean) - np.min(f0_clean)) if len(f0_clean) > 0 else 0
+        f0 = estimate_pitch(y, sr, backend=self.pitch_backend, frame_stride=pitch_frame_stride)
+        features.update(pitch_stats(f0))
         
         # Formants (vowel features)
         mfccs = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
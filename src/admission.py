@@ -0,0 +1,159 @@
+import json
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+import soundfile as sf
+from config.settings import *
+
+class AdmissionRejected(Exception):
+    """Raised when a job cannot fit the memory budget even after downgrading"""
+
+    def __init__(self, decision):
+        self.decision = decision
+        super().__init__(
+            f"Job rejected: needs ~{decision['estimated_peak_mb']:.0f}MB, "
+            f"{decision['available_mb']:.0f}MB of {decision['budget_mb']:.0f}MB budget available"
+        )
+
+def probe_audio(path):
+    """Reads duration, sample rate and channels without decoding the audio"""
+    try:
+        info = sf.info(str(path))
+        return {"duration": info.duration, "sample_rate": info.samplerate,
+                "channels": info.channels, "probed": True}
+    except Exception:
+        pass
+
+    try:
+        output = subprocess.run(
+            ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+             '-show_entries', 'stream=sample_rate,channels:format=duration',
+             '-of', 'json', str(path)],
+            capture_output=True, check=True, text=True
+        ).stdout
+        data = json.loads(output)
+        stream = data["streams"][0]
+        return {"duration": float(data["format"]["duration"]),
+                "sample_rate": int(stream["sample_rate"]),
+                "channels": int(stream["channels"]), "probed": True}
+    except Exception:
+        # Unknown media: assume the worst case we would ever decode
+        return {"duration": float(MAX_AUDIO_LENGTH), "sample_rate": 48000,
+                "channels": 2, "probed": False}
+
+def estimate_resources(duration, sample_rate, channels=1,
+                       profile=DEFAULT_PROCESSING_PROFILE, max_seconds=MAX_AUDIO_LENGTH):
+    """Predicts peak memory and CPU time for one job before decoding"""
+    settings = PROCESSING_PROFILES[profile]
+    analysed = min(duration, max_seconds)
+
+    # librosa decodes at the native rate before resampling to SAMPLE_RATE
+    native_bytes = analysed * sample_rate * channels * 4
+    working_bytes = analysed * SAMPLE_RATE * 4 * settings["memory_factor"]
+
+    return {
+        "profile": profile,
+        "max_seconds": max_seconds,
+        "estimated_peak_mb": round((native_bytes + working_bytes) / (1024 * 1024), 1),
+        "estimated_cpu_seconds": round(analysed * settings["cpu_factor"], 1),
+    }
+
+class AdmissionController:
+    """Keeps the estimated peak memory of concurrent jobs within a budget
+
+    Jobs that do not fit wait in a queue; after queue_timeout they are
+    downgraded to the light profile and shorter windows, or rejected.
+    """
+
+    def __init__(self, memory_budget_mb=MEMORY_BUDGET_MB, queue_timeout=ADMISSION_QUEUE_TIMEOUT,
+                 min_window=MIN_ADMISSION_WINDOW):
+        self.memory_budget_mb = memory_budget_mb
+        self.queue_timeout = queue_timeout
+        self.min_window = min_window
+        self._in_use_mb = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def admit(self, duration, sample_rate, channels=1):
+        """Reserves memory for the job; yields the decision dict"""
+        decision = self._acquire(duration, sample_rate, channels)
+        try:
+            yield decision
+        finally:
+            with self._cond:
+                self._in_use_mb -= decision["estimated_peak_mb"]
+                self._cond.notify_all()
+
+    def _options(self, duration, sample_rate, channels):
+        window = min(duration, MAX_AUDIO_LENGTH)
+        options = [estimate_resources(duration, sample_rate, channels)]
+
+        seconds = window
+        while True:
+            options.append(estimate_resources(duration, sample_rate, channels,
+                                              profile="light", max_seconds=seconds))
+            if seconds <= self.min_window:
+                break
+            seconds = max(seconds / 2, self.min_window)
+        return options
+
+    def _acquire(self, duration, sample_rate, channels):
+        start = time.monotonic()
+        options = self._options(duration, sample_rate, channels)
+        viable = [o for o in options if o["estimated_peak_mb"] <= self.memory_budget_mb]
+
+        with self._cond:
+            if not viable:
+                self._finish(options[-1], "rejected", start)
+                raise AdmissionRejected(options[-1])
+
+            # Queue for the best viable option first
+            preferred = viable[0]
+            deadline = start + self.queue_timeout
+            waited = False
+            while not self._fits(preferred):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                waited = True
+                self._cond.wait(remaining)
+
+            chosen = preferred if self._fits(preferred) else next(
+                (o for o in viable if self._fits(o)), None)
+            if chosen is None:
+                self._finish(viable[-1], "rejected", start)
+                raise AdmissionRejected(viable[-1])
+
+            self._in_use_mb += chosen["estimated_peak_mb"]
+
+            if chosen is not options[0]:
+                action = "downgraded"
+            elif waited:
+                action = "queued"
+            else:
+                action = "admitted"
+            return self._finish(chosen, action, start)
+
+    def _fits(self, option):
+        return self._in_use_mb + option["estimated_peak_mb"] <= self.memory_budget_mb
+
+    def _finish(self, option, action, start):
+        option.update({
+            "action": action,
+            "waited_seconds": round(time.monotonic() - start, 2),
+            "budget_mb": self.memory_budget_mb,
+            "available_mb": round(self.memory_budget_mb - self._in_use_mb, 1),
+        })
+        return option
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_admission_controller():
+    """Process-wide controller shared by every request path"""
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController()
+        return _controller
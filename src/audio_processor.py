@@ -1,54 +1,101 @@
 import os
+import time
 from pathlib import Path
 import yt_dlp
 import librosa
 import soundfile as sf
 from config.settings import *
+from src.workspace import get_workspace
 
 class AudioProcessor:
-    def __init__(self):
+    def __init__(self, workspace=None, quiet=False):
         self.temp_dir = TEMP_DIR
         self.sample_rate = SAMPLE_RATE
+        self.workspace = workspace or get_workspace()
+        self.quiet = quiet
 
-    def download_and_extract_audio(self, url):
+    def download_and_extract_audio(self, url, job=None):
         """Download video and extract audio"""
 
+        if job is None:
+            # Caller owns the returned file, so keep it past the job
+            with self.workspace.job(keep=True) as job:
+                return self.download_and_extract_audio(url, job=job)
+
+        return self._process_audio(self.download_audio(url, job), job=job)
+
+    def download_audio(self, url, job, timings=None):
+        """Download video into the job directory and return the raw wav path
+
+        If a timings dict is given it is filled with download and ffmpeg
+        conversion times (seconds) and the downloaded byte count.
+        """
+
         ydl_opts = {
             'format': 'bestaudio/best',
-            'outtmpl': f'{self.temp_dir}/%(title)s.%(ext)s',
+            'outtmpl': str(job.temp_path('%(id)s.%(ext)s')),
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',
                 'preferredcodec': 'wav',
             }],
             'max_filesize': MAX_DOWNLOAD_SIZE,
+            'quiet': self.quiet,
+            'noprogress': self.quiet,
         }
+        if timings is not None:
+            ydl_opts.update(self._timing_hooks(timings))
 
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=True)
-                title = info.get('title', 'audio')
 
-                audio_file = f"{self.temp_dir}/{title}.wav"
+                audio_file = Path(ydl.prepare_filename(info)).with_suffix('.wav')
 
                 if os.path.exists(audio_file):
-                    return self._process_audio(audio_file)
+                    return audio_file
                 else:
                     raise FileNotFoundError("Could not extract audio")
 
         except Exception as e:
             raise Exception(f"Error downloading video: {str(e)}")
 
-    def _process_audio(self, audio_path):
+    def _timing_hooks(self, timings):
+        """yt-dlp hooks that record per-stage durations into timings"""
+        start = time.perf_counter()
+        convert_start = []
+
+        def on_progress(d):
+            if d['status'] == 'finished':
+                timings['download_seconds'] = time.perf_counter() - start
+                timings['downloaded_bytes'] = d.get('total_bytes') or d.get('downloaded_bytes') or 0
+
+        def on_postprocess(d):
+            if d['postprocessor'] != 'ExtractAudio':
+                return
+            # yt-dlp reports nested started/finished pairs; time the outermost one
+            if d['status'] == 'started' and not convert_start:
+                convert_start.append(time.perf_counter())
+            elif d['status'] == 'finished' and convert_start:
+                timings['convert_seconds'] = time.perf_counter() - convert_start[0]
+
+        return {'progress_hooks': [on_progress], 'postprocessor_hooks': [on_postprocess]}
+
+    def _process_audio(self, audio_path, job=None, max_seconds=MAX_AUDIO_LENGTH):
         """Process and normalize audio"""
 
-        y, sr = librosa.load(audio_path, sr=self.sample_rate)
+        if job is None:
+            with self.workspace.job(keep=True) as job:
+                return self._process_audio(audio_path, job=job, max_seconds=max_seconds)
+
+        # Only decode the window we analyse
+        y, sr = librosa.load(audio_path, sr=self.sample_rate, duration=max_seconds)
 
-        if len(y) > MAX_AUDIO_LENGTH * self.sample_rate:
-            y = y[:MAX_AUDIO_LENGTH * self.sample_rate]
+        if len(y) > int(max_seconds * self.sample_rate):
+            y = y[:int(max_seconds * self.sample_rate)]
 
         y = librosa.util.normalize(y)
 
-        output_path = PROCESSED_AUDIO_DIR / f"processed_{Path(audio_path).stem}.wav"
+        output_path = job.processed_path(Path(audio_path).stem)
         sf.write(output_path, y, self.sample_rate)
 
         return str(output_path)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+English Accent Classifier - Incremental ingestion of audio files dropped into a directory
+"""
+import click
+import sys
+import os
+import json
+import logging
+import time
+import uuid
+from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.audio_processor import AudioProcessor
+from src.accent_classifier import EnglishAccentClassifier
+from src.workspace import get_workspace
+from src.pipeline import analyze_file
+from src.results import open_result_writer
+from src.profiling import profile_request
+from config.settings import *
+
+logger = logging.getLogger(__name__)
+
+class DirectoryIndex:
+    """mtime/size index of already processed files, keyed by relative path"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.files = {}
+        self.errors = {}
+        self.dirty = False
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.errors = data.get("errors", {})
+
+    @staticmethod
+    def signature(stat):
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def is_current(self, rel_path, stat):
+        return self.files.get(rel_path) == self.signature(stat)
+
+    def mark(self, rel_path, stat, error=None):
+        self.files[rel_path] = self.signature(stat)
+        if error:
+            self.errors[rel_path] = error
+        else:
+            self.errors.pop(rel_path, None)
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Write-then-rename so a crash never leaves a truncated index
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"files": self.files, "errors": self.errors}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+class DirectoryIngester:
+    def __init__(self, directory, results_dir=None, results_writer=None, processor=None,
+                 classifier=None, workspace=None, index_path=None, profile=False,
+                 profile_mode=PROFILE_MODE, profile_interval=PROFILE_INTERVAL):
+        self.directory = Path(directory).resolve()
+        self.results_dir = Path(results_dir).resolve() if results_dir else None
+        self.results_writer = results_writer
+        self.workspace = workspace or get_workspace()
+        self.processor = processor or AudioProcessor(self.workspace)
+        self._classifier = classifier
+        self.index = DirectoryIndex(index_path or self.directory / INGEST_INDEX_NAME)
+        self.profile = profile
+        self.profile_mode = profile_mode
+        self.profile_interval = profile_interval
+
+    @property
+    def classifier(self):
+        # Loaded once and kept warm across scans
+        if self._classifier is None:
+            self._classifier = EnglishAccentClassifier()
+        return self._classifier
+
+    def scan(self):
+        """Returns (path, relative path, stat) for new or changed audio files"""
+        settled_before = time.time() - INGEST_SETTLE_SECONDS
+        prefix_length = len(str(self.directory)) + 1
+        results_dir = str(self.results_dir) if self.results_dir else None
+        is_current = self.index.is_current
+        pending = []
+        stack = [str(self.directory)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except (FileNotFoundError, PermissionError):
+                # Subdirectory removed or unreadable since it was listed
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.path != results_dir:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(AUDIO_EXTENSIONS):
+                        continue
+
+                    try:
+                        stat = entry.stat()
+                    except (FileNotFoundError, PermissionError):
+                        # Dangling symlink, or moved/deleted since listing
+                        continue
+                    rel_path = entry.path[prefix_length:]
+                    # Skip files that may still be being copied in
+                    if stat.st_mtime > settled_before or is_current(rel_path, stat):
+                        continue
+                    pending.append((entry.path, rel_path, stat))
+        return sorted(pending)
+
+    def process(self, path, rel_path, stat):
+        """Classifies one file and writes its results"""
+        job_id = uuid.uuid4().hex
+        try:
+            # Only the N slowest profiles are kept, so profiling every file is cheap on disk
+            with profile_request(job_id, enabled=self.profile, mode=self.profile_mode,
+                                 interval=self.profile_interval) as profile_info:
+                with self.workspace.job(job_id=job_id) as job:
+                    results = analyze_file(self.processor, self.classifier, path, job,
+                                           metadata={"source": rel_path})
+            if self.profile:
+                results["metadata"]["profile_path"] = profile_info["profile_path"]
+            self._write_results(path, rel_path, results)
+            error = None
+        except Exception as e:
+            results = None
+            error = str(e)
+        # Failed files are retried only once they change on disk
+        self.index.mark(rel_path, stat, error)
+        return results, error
+
+    def run_once(self, on_result=None):
+        """Processes every new or changed file once; returns how many were processed"""
+        pending = self.scan()
+        for count, (path, rel_path, stat) in enumerate(pending, 1):
+            results, error = self.process(path, rel_path, stat)
+            if on_result:
+                on_result(rel_path, results, error)
+            if count % INGEST_INDEX_FLUSH_EVERY == 0:
+                self._checkpoint()
+        self._checkpoint()
+        return len(pending)
+
+    def watch(self, interval=INGEST_POLL_INTERVAL, on_result=None):
+        """Polls the directory forever; a failed scan is logged and retried"""
+        while True:
+            try:
+                # Reclaims what other, crashed processes left in the shared workspace
+                self.workspace.cleanup_stale()
+                self.run_once(on_result=on_result)
+            except Exception:
+                logger.exception("Ingestion pass over %s failed", self.directory)
+            time.sleep(interval)
+
+    def _checkpoint(self):
+        # Results reach disk before the index marks their files as done
+        if self.results_writer:
+            self.results_writer.flush()
+        self.index.save()
+
+    def _write_results(self, path, rel_path, results):
+        if self.results_writer:
+            self.results_writer.write(results)
+            return
+        if self.results_dir:
+            output = self.results_dir / f"{rel_path}.accent.json"
+            output.parent.mkdir(parents=True, exist_ok=True)
+        else:
+            output = Path(f"{path}.accent.json")
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+@click.command()
+@click.option('--dir', 'directory', default=str(SAMPLE_VIDEOS_DIR), help='Directory to ingest')
+@click.option('--results-dir', default=None, help='Write results here instead of next to each file')
+@click.option('--results-sink', default=None,
+              help='Append results to a .jsonl, .jsonl.gz or Parquet directory sink instead')
+@click.option('--watch', is_flag=True, help='Keep polling for new files')
+@click.option('--interval', default=INGEST_POLL_INTERVAL, help='Seconds between scans in watch mode')
+@click.option('--profile', is_flag=True, help='Profile each file, keeping the slowest profiles')
+@click.option('--profile-mode', type=click.Choice(['sample', 'deterministic']), default=PROFILE_MODE,
+              help='Stack sampling (collapsed stacks) or cProfile (.prof)')
+@click.option('--profile-interval', default=PROFILE_INTERVAL, help='Seconds between stack samples')
+def ingest(directory, results_dir, results_sink, watch, interval, profile, profile_mode,
+           profile_interval):
+    """Classifies new or changed audio files in a directory"""
+
+    logging.basicConfig(level=LOG_LEVEL)
+
+    click.echo("English Accent Classifier - Directory ingestion")
+    click.echo("=" * 50)
+
+    def report(rel_path, results, error):
+        if error:
+            click.echo(f"{rel_path}: error: {error}", err=True)
+        else:
+            click.echo(f"{rel_path}: {results['accent_classification']} "
+                       f"({results['confidence_score']*100:.1f}%)")
+
+    writer = open_result_writer(results_sink) if results_sink else None
+    ingester = DirectoryIngester(directory, results_dir=results_dir, results_writer=writer,
+                                 profile=profile, profile_mode=profile_mode,
+                                 profile_interval=profile_interval)
+    ingester.workspace.cleanup_stale()
+
+    try:
+        if watch:
+            click.echo(f"Watching {ingester.directory} every {interval}s (Ctrl+C to stop)")
+            ingester.watch(interval=interval, on_result=report)
+        else:
+            processed = ingester.run_once(on_result=report)
+            click.echo(f"Processed {processed} new or changed file(s)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if writer:
+            writer.close()
+        ingester.index.save()
+
+if __name__ == '__main__':
+    ingest()
@@ -6,17 +6,31 @@ import click
 import sys
 import os
 import json
+import uuid
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.audio_processor import AudioProcessor
 from src.accent_classifier import EnglishAccentClassifier
+from src.workspace import get_workspace
+from src.pipeline import analyze_file
+from src.results import open_result_writer
+from src.profiling import profile_request
 from config.settings import *
 
 @click.command()
 @click.option('--url', required=True, help='URL of the video to analyze')
 @click.option('--output', default='accent_results.json', help='Output file')
 @click.option('--verbose', is_flag=True, help='Verbose mode')
-def classify_accent(url, output, verbose):
+@click.option('--keep-audio', is_flag=True, default=KEEP_PROCESSED_AUDIO,
+              help='Keep processed audio (subject to the disk quota)')
+@click.option('--results-sink', default=None,
+              help='Also append the result to a .jsonl, .jsonl.gz or Parquet directory sink')
+@click.option('--profile', is_flag=True, help='Profile the run and save a flame-graph file')
+@click.option('--profile-mode', type=click.Choice(['sample', 'deterministic']), default=PROFILE_MODE,
+              help='Stack sampling (collapsed stacks) or cProfile (.prof)')
+@click.option('--profile-interval', default=PROFILE_INTERVAL, help='Seconds between stack samples')
+def classify_accent(url, output, verbose, keep_audio, results_sink, profile, profile_mode,
+                    profile_interval):
     """Classifies the English accent from a video URL"""
     
     click.echo("English Accent Classifier")
@@ -26,18 +40,38 @@ def classify_accent(url, output, verbose):
         click.echo(f"Analyzing video: {url}")
     
     try:
-        # 1. Process audio
-        click.echo("Downloading and extracting audio...")
-        processor = AudioProcessor()
-        audio_path = processor.download_and_extract_audio(url)
-        
-        if verbose:
-            click.echo(f"Audio extracted: {audio_path}")
-        
-        # 2. Classify accent
-        click.echo("Analyzing English accent...")
-        classifier = EnglishAccentClassifier()
-        results = classifier.classify_accent(audio_path)
+        workspace = get_workspace()
+        workspace.cleanup_stale()
+
+        job_id = uuid.uuid4().hex
+        with profile_request(job_id, enabled=profile, mode=profile_mode,
+                             interval=profile_interval) as profile_info:
+            with workspace.job(job_id=job_id, keep=keep_audio) as job:
+                # 1. Process audio
+                click.echo("Downloading and extracting audio...")
+                processor = AudioProcessor(workspace)
+                raw_audio_path = processor.download_audio(url, job)
+
+                if verbose:
+                    click.echo(f"Audio extracted: {raw_audio_path}")
+
+                # 2. Classify accent (admission control bounds memory per job)
+                click.echo("Analyzing English accent...")
+                classifier = EnglishAccentClassifier()
+                results = analyze_file(processor, classifier, raw_audio_path, job,
+                                       metadata={"source": url})
+
+                admission = results["metadata"]["admission"]
+                if verbose or admission["action"] == "downgraded":
+                    click.echo(f"Admission: {admission['action']} ({admission['profile']} profile, "
+                               f"{admission['max_seconds']:.0f}s window, "
+                               f"~{admission['estimated_peak_mb']:.0f}MB)")
+
+        if profile:
+            results["metadata"]["profile_path"] = profile_info["profile_path"]
+            click.echo(f"Profile saved to: {profile_info['profile_path']}"
+                       if profile_info["profile_path"] else
+                       "Profile discarded (faster than the slowest kept profiles)")
         
         # 3. Show main results
         click.echo("\n" + "="*50)
@@ -65,6 +99,11 @@ def classify_accent(url, output, verbose):
             json.dump(results, f, indent=2, ensure_ascii=False)
         
         click.echo(f"\nFull results saved to: {output}")
+
+        if results_sink:
+            with open_result_writer(results_sink) as writer:
+                writer.write(results)
+            click.echo(f"Result appended to: {results_sink}")
         
         # 5. Final summary
         click.echo("\n" + "="*50)
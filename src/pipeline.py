@@ -0,0 +1,15 @@
+from src.admission import get_admission_controller, probe_audio
+
+def analyze_file(processor, classifier, raw_path, job, admission=None, metadata=None):
+    """Admits, decodes and classifies a raw audio file within a job"""
+
+    admission = admission or get_admission_controller()
+    info = probe_audio(raw_path)
+
+    with admission.admit(info["duration"], info["sample_rate"], info["channels"]) as decision:
+        audio_path = processor._process_audio(raw_path, job=job, max_seconds=decision["max_seconds"])
+        return classifier.classify_accent(
+            audio_path,
+            profile=decision["profile"],
+            metadata=dict(metadata or {}, job_id=job.id, source_audio=info, admission=decision),
+        )
@@ -0,0 +1,102 @@
+import librosa
+import numpy as np
+from scipy import fft
+from config.settings import *
+
+# Reference frame geometry at SAMPLE_RATE, matching librosa.yin defaults
+_FRAME_LENGTH = 2048
+_HOP_LENGTH = 512
+
+# Relative height a shorter-lag peak needs to win over the global maximum
+_OCTAVE_RATIO = 0.85
+
+def yin_pitch(y, sr, fmin=PITCH_FMIN, fmax=PITCH_FMAX, **kwargs):
+    """Reference backend: librosa YIN over every frame"""
+    f0 = librosa.yin(y, fmin=fmin, fmax=fmax, sr=sr)
+    return f0[f0 > 0]
+
+def fast_acf_pitch(y, sr, fmin=PITCH_FMIN, fmax=PITCH_FMAX,
+                   decimation=PITCH_DECIMATION, frame_stride=PITCH_FRAME_STRIDE,
+                   energy_ratio=PITCH_ENERGY_RATIO,
+                   voicing_threshold=PITCH_VOICING_THRESHOLD):
+    """FFT autocorrelation pitch on decimated audio, voiced frames only"""
+
+    if decimation > 1:
+        y = librosa.resample(y, orig_sr=sr, target_sr=sr / decimation, res_type='soxr_lq')
+        sr = sr / decimation
+    y = np.asarray(y, dtype=np.float32)
+
+    frame_length = max(_FRAME_LENGTH // max(decimation, 1), int(np.ceil(2 * sr / fmin)))
+    hop_length = max(_HOP_LENGTH // max(decimation, 1), 1)
+    if len(y) < frame_length:
+        return np.array([])
+
+    frames = np.lib.stride_tricks.sliding_window_view(y, frame_length)[::hop_length]
+
+    # Energy gate, same criterion as the pause ratio estimate
+    power = np.concatenate(([0.0], np.cumsum(y.astype(np.float64) ** 2)))
+    starts = np.arange(len(frames)) * hop_length
+    rms = np.sqrt(np.maximum(power[starts + frame_length] - power[starts], 0) / frame_length)
+    voiced = np.flatnonzero(rms > np.mean(rms) * energy_ratio)[::max(frame_stride, 1)]
+    if len(voiced) == 0:
+        return np.array([])
+
+    window = np.hanning(frame_length).astype(np.float32)
+    segment = frames[voiced] * window
+    segment -= segment.mean(axis=1, keepdims=True)
+
+    n_fft = 1 << int(np.ceil(np.log2(2 * frame_length)))
+    acf = fft.irfft(np.abs(fft.rfft(segment, n=n_fft, axis=1)) ** 2, axis=1)[:, :frame_length]
+
+    # Divide out the window's own autocorrelation so long lags aren't penalised
+    window_acf = fft.irfft(np.abs(fft.rfft(window, n=n_fft)) ** 2)[:frame_length]
+    energy = acf[:, :1]
+    energy[energy == 0] = np.inf
+    acf = (acf / energy) / (window_acf / window_acf[0])
+
+    min_lag = max(int(np.floor(sr / fmax)), 1)
+    max_lag = min(int(np.ceil(sr / fmin)), frame_length - 2)
+    region = acf[:, min_lag - 1:max_lag + 2]
+    inner = region[:, 1:-1]
+    is_peak = (inner >= region[:, :-2]) & (inner >= region[:, 2:])
+
+    # First local peak close to the strongest one, to avoid octave-down errors
+    best = np.max(np.where(is_peak, inner, -np.inf), axis=1, keepdims=True)
+    candidate = is_peak & (inner >= best * _OCTAVE_RATIO)
+    lag = np.argmax(candidate, axis=1) + min_lag
+
+    rows = np.arange(len(lag))
+    peak = acf[rows, lag]
+    keep = np.any(candidate, axis=1) & (peak > voicing_threshold)
+    if not np.any(keep):
+        return np.array([])
+    rows, lag = rows[keep], lag[keep]
+
+    # Parabolic interpolation around the peak for sub-sample lag
+    a, b, c = acf[rows, lag - 1], acf[rows, lag], acf[rows, lag + 1]
+    denom = a - 2 * b + c
+    shift = np.where(denom != 0, 0.5 * (a - c) / np.where(denom != 0, denom, 1), 0)
+    f0 = sr / (lag + np.clip(shift, -0.5, 0.5))
+
+    return f0[(f0 >= fmin) & (f0 <= fmax)]
+
+PITCH_BACKENDS = {
+    "yin": yin_pitch,
+    "fast_acf": fast_acf_pitch,
+}
+
+def estimate_pitch(y, sr, backend=PITCH_BACKEND, **kwargs):
+    """Returns F0 values (Hz) of voiced frames using the selected backend"""
+    if backend not in PITCH_BACKENDS:
+        raise ValueError(f"Unknown pitch backend: {backend}")
+    return PITCH_BACKENDS[backend](y, sr, **kwargs)
+
+def pitch_stats(f0):
+    """Summary statistics used by the accent features"""
+    if len(f0) == 0:
+        return {'f0_mean': 0, 'f0_std': 0, 'f0_range': 0}
+    return {
+        'f0_mean': float(np.mean(f0)),
+        'f0_std': float(np.std(f0)),
+        'f0_range': float(np.max(f0) - np.min(f0)),
+    }
@@ -0,0 +1,128 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from config.settings import *
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and counts collapsed stacks"""
+
+    def __init__(self, interval=PROFILE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.counts = Counter()
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path):
+        """Collapsed-stack format, readable by flamegraph.pl and speedscope"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ProfileStore:
+    """Keeps only the profiles of the N slowest requests"""
+
+    def __init__(self, directory=PROFILE_DIR, keep=PROFILE_KEEP_SLOWEST):
+        self.directory = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _entries(self):
+        # Files are named <duration_ms>ms-<job_id>.<ext> so the name carries the ranking
+        if not self.directory.exists():
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            duration, sep, _ = entry.name.partition("ms-")
+            if sep and duration.isdigit():
+                entries.append((int(duration), entry.path))
+        return sorted(entries, reverse=True)
+
+    def save(self, job_id, duration, extension, write):
+        """Writes the profile if it ranks among the slowest; returns its path or None"""
+        duration_ms = int(duration * 1000)
+        with self._lock:
+            entries = self._entries()
+            if len(entries) >= self.keep and duration_ms <= entries[self.keep - 1][0]:
+                return None
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{duration_ms:09d}ms-{job_id}.{extension}"
+            write(path)
+
+            for _, stale in self._entries()[self.keep:]:
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+        return str(path)
+
+_store = None
+
+def get_profile_store():
+    global _store
+    if _store is None:
+        _store = ProfileStore()
+    return _store
+
+@contextmanager
+def profile_request(job_id, enabled=True, mode=PROFILE_MODE, interval=PROFILE_INTERVAL, store=None):
+    """Profiles the enclosed block; yields a dict that gets 'profile_path' on exit
+
+    'profile_path' is None when the request wasn't slow enough to be kept.
+    """
+    info = {}
+    if not enabled:
+        yield info
+        return
+
+    store = store or get_profile_store()
+    if mode == "deterministic":
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = StackSampler(interval=interval)
+        profiler.start()
+
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        duration = time.perf_counter() - start
+        if mode == "deterministic":
+            profiler.disable()
+            info["profile_path"] = store.save(job_id, duration, "prof", profiler.dump_stats)
+        else:
+            profiler.stop()
+            info["profile_path"] = store.save(job_id, duration, "collapsed", profiler.write)
+        info["profile_seconds"] = round(duration, 3)
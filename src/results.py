@@ -0,0 +1,318 @@
+import gzip
+import json
+import os
+import time
+import uuid
+import zlib
+from collections import Counter
+from pathlib import Path
+from config.settings import *
+
+# Fixed result schema; transcripts are stored apart so aggregates never parse them
+RESULT_SCHEMA = [
+    ("job_id", "string"),
+    ("source", "string"),
+    ("created_at", "float64"),
+    ("accent_classification", "string"),
+    ("confidence_score", "float64"),
+    ("english_confidence", "float64"),
+    ("profile", "string"),
+    ("admission_action", "string"),
+    ("explanation", "string"),
+    ("metadata", "string"),
+]
+TRANSCRIPT_FIELD = "transcription"
+
+# Reused encoders skip json.dumps' per-call encoder construction
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+_encode_metadata = json.JSONEncoder(separators=(',', ':'), default=str).encode
+
+def to_record(results):
+    """Flattens a classify_accent result into (summary record, transcript)"""
+    metadata = results.get("metadata", {})
+    record = {
+        "job_id": metadata.get("job_id") or uuid.uuid4().hex,
+        "source": metadata.get("source"),
+        "created_at": time.time(),
+        "accent_classification": results.get("accent_classification"),
+        "confidence_score": float(results.get("confidence_score", 0)),
+        "english_confidence": float(results.get("english_confidence", 0)),
+        "profile": metadata.get("profile"),
+        "admission_action": metadata.get("admission", {}).get("action"),
+        "explanation": results.get("explanation", ""),
+        "metadata": _encode_metadata(metadata),
+    }
+    return record, results.get("transcription", "")
+
+def transcripts_path(path):
+    """results.jsonl[.gz] -> results.transcripts.jsonl[.gz]"""
+    path = Path(path)
+    suffix = ".jsonl.gz" if path.name.endswith(".jsonl.gz") else ".jsonl"
+    return path.with_name(path.name[:-len(suffix)] + ".transcripts" + suffix)
+
+def arrow_schema(pa):
+    """RESULT_SCHEMA plus the transcript column as a pyarrow schema"""
+    return pa.schema(
+        [(name, getattr(pa, kind)()) for name, kind in RESULT_SCHEMA]
+        + [(TRANSCRIPT_FIELD, pa.large_string())]
+    )
+
+class ResultWriter:
+    """Buffers records in memory and appends them in batches"""
+
+    def __init__(self, buffer_size=RESULTS_BUFFER_SIZE, fsync_every=RESULTS_FSYNC_EVERY):
+        self.buffer_size = buffer_size
+        self.fsync_every = fsync_every
+        self._buffer = []
+        self._flushes = 0
+
+    def write(self, results):
+        self._buffer.append(to_record(results))
+        if len(self._buffer) >= self.buffer_size:
+            self._write_buffer()
+
+    def flush(self):
+        """Writes buffered records and makes everything written so far durable"""
+        self._write_buffer()
+        self._sync()
+
+    def close(self):
+        self.flush()
+        self._close()
+
+    def _write_buffer(self):
+        if not self._buffer:
+            return
+        self._write_batch(self._buffer)
+        self._buffer = []
+        self._flushes += 1
+        if self._flushes % self.fsync_every == 0:
+            self._sync()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _gzip_members(f, chunk_size=1 << 20):
+    """Yields (data, end offset) for each complete gzip member, stopping at a torn tail"""
+    offset = 0
+    pending = b""
+    while True:
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        chunks = []
+        while not decompressor.eof:
+            if not pending:
+                pending = f.read(chunk_size)
+                if not pending:
+                    # Clean end of file, or a member cut short by a crash
+                    return
+            try:
+                chunks.append(decompressor.decompress(pending))
+            except zlib.error:
+                return
+            offset += len(pending) - len(decompressor.unused_data)
+            pending = decompressor.unused_data
+        yield b"".join(chunks), offset
+
+def _complete_length(path, compress):
+    """Length of the prefix of a JSONL sink holding only complete batches"""
+    with open(path, 'rb') as f:
+        if compress:
+            end = 0
+            for _, end in _gzip_members(f):
+                pass
+            return end
+        # Plain JSONL: everything up to the last newline
+        position = f.seek(0, os.SEEK_END)
+        while position > 0:
+            step = min(position, 64 * 1024)
+            position -= step
+            f.seek(position)
+            newline = f.read(step).rfind(b"\n")
+            if newline >= 0:
+                return position + newline + 1
+        return 0
+
+class JsonlResultWriter(ResultWriter):
+    """Compact JSONL, optionally gzip-compressed, with transcripts in a sibling file
+
+    Compressed sinks hold one complete gzip member per batch, so a crash loses
+    at most the batch being written; a torn tail is cut off on the next open.
+    """
+
+    def __init__(self, path, compress=None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        if compress is None:
+            compress = self.path.suffix == ".gz"
+        self.compress = compress
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._files = [self._open(self.path), self._open(transcripts_path(self.path))]
+
+    def _open(self, path):
+        if path.exists():
+            length = _complete_length(path, self.compress)
+            if length < path.stat().st_size:
+                os.truncate(path, length)
+        return open(path, 'ab')
+
+    def _write_batch(self, batch):
+        summary = "".join([_encode(record) + "\n" for record, _ in batch])
+        transcripts = "".join([_encode({"job_id": record["job_id"], TRANSCRIPT_FIELD: text}) + "\n"
+                               for record, text in batch])
+        for f, data in zip(self._files, (summary, transcripts)):
+            data = data.encode('utf-8')
+            f.write(gzip.compress(data, compresslevel=6) if self.compress else data)
+            f.flush()
+
+    def _sync(self):
+        for f in self._files:
+            os.fsync(f.fileno())
+
+    def _close(self):
+        for f in self._files:
+            f.close()
+
+class ParquetResultWriter(ResultWriter):
+    """Parquet part files inside a dataset directory, one row group per flush
+
+    The part being written is named with a leading underscore, which pyarrow
+    datasets ignore, and renamed to part-*.parquet once its footer is on disk.
+    Rows only become durable when their part is published, so a part is
+    published on every explicit flush() and every fsync_every buffer writes,
+    as well as every part_rows rows or part_flushes buffer writes.
+    """
+
+    def __init__(self, directory, part_rows=RESULTS_PARQUET_PART_ROWS,
+                 part_flushes=RESULTS_PARQUET_PART_FLUSHES, **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet results require pyarrow: pip install pyarrow")
+
+        self._pa = pa
+        self._pq = pq
+        self.schema = arrow_schema(pa)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.part_rows = part_rows
+        self.part_flushes = part_flushes
+        self.published = []
+        self._writer = None
+
+    def _open_part(self):
+        name = f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet"
+        self._path = self.directory / name
+        self._tmp_path = self.directory / f"_{name}"
+        self._writer = self._pq.ParquetWriter(str(self._tmp_path), self.schema, compression='zstd')
+        self._part_row_count = 0
+        self._part_flush_count = 0
+
+    def _write_batch(self, batch):
+        if self._writer is None:
+            self._open_part()
+        columns = {name: [record[name] for record, _ in batch] for name, _ in RESULT_SCHEMA}
+        columns[TRANSCRIPT_FIELD] = [text for _, text in batch]
+        self._writer.write_table(self._pa.table(columns, schema=self.schema))
+
+        self._part_row_count += len(batch)
+        self._part_flush_count += 1
+        if self._part_row_count >= self.part_rows or self._part_flush_count >= self.part_flushes:
+            self._publish()
+
+    def _publish(self):
+        """Finishes the current part, fsyncs it and renames it into the dataset"""
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+
+        fd = os.open(self._tmp_path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(self._tmp_path, self._path)
+
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self.published.append(str(self._path))
+
+    def _sync(self):
+        # An unfinished part has no footer, so it only becomes durable once published
+        self._publish()
+
+    def _close(self):
+        self._publish()
+
+def _is_jsonl(path):
+    return str(path).endswith((".jsonl", ".jsonl.gz"))
+
+def open_result_writer(path, **kwargs):
+    """Picks the writer from the path: *.jsonl[.gz] or a Parquet dataset directory"""
+    if _is_jsonl(path):
+        return JsonlResultWriter(path, **kwargs)
+    return ParquetResultWriter(path, **kwargs)
+
+def iter_records(path):
+    """Yields summary records from a JSONL sink without reading transcripts
+
+    A torn tail left by a writer that crashed mid-batch is skipped.
+    """
+    with open(path, 'rb') as f:
+        if str(path).endswith(".gz"):
+            lines = (line for data, _ in _gzip_members(f) for line in data.splitlines(keepends=True))
+        else:
+            lines = f
+        for line in lines:
+            if not line.endswith(b"\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+def read_aggregates(path):
+    """Accent counts and mean confidences, computed from summary columns only"""
+    counts = Counter()
+    confidence = Counter()
+    english = 0.0
+
+    if _is_jsonl(path):
+        for record in iter_records(path):
+            accent = record["accent_classification"] or "Not English"
+            counts[accent] += 1
+            confidence[accent] += record["confidence_score"]
+            english += record["english_confidence"]
+    else:
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow as pa
+        # The schema keeps a dataset with no published parts yet readable (and empty)
+        table = ds.dataset(str(path), format="parquet", schema=arrow_schema(pa)).to_table(
+            columns=["accent_classification", "confidence_score", "english_confidence"]
+        )
+        table = table.set_column(0, "accent_classification",
+                                 pc.fill_null(table["accent_classification"], "Not English"))
+        grouped = table.group_by("accent_classification").aggregate(
+            [("confidence_score", "sum"), ("confidence_score", "count")]
+        )
+        for row in grouped.to_pylist():
+            counts[row["accent_classification"]] = row["confidence_score_count"]
+            confidence[row["accent_classification"]] = row["confidence_score_sum"]
+        english = pc.sum(table["english_confidence"]).as_py() or 0.0
+
+    total = sum(counts.values())
+    return {
+        "total": total,
+        "mean_english_confidence": round(english / total, 3) if total else 0,
+        "accents": {
+            accent: {"count": count, "mean_confidence": round(confidence[accent] / count, 3)}
+            for accent, count in counts.most_common()
+        },
+    }
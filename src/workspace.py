@@ -0,0 +1,175 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from config.settings import *
+
+class Job:
+    """Per-job scratch directory and the artifacts it produced"""
+
+    def __init__(self, job_id, job_dir, workspace):
+        self.id = job_id
+        self.dir = job_dir
+        self.workspace = workspace
+        self.artifacts = []
+
+    def temp_path(self, name):
+        """Path inside the job directory, removed when the job ends"""
+        return self.dir / name
+
+    def processed_path(self, stem):
+        """Unique path for processed audio, tracked as a job artifact"""
+        path = self.workspace.processed_dir / f"processed_{stem}_{self.id}.wav"
+        self.artifacts.append(path)
+        self.workspace._activate(path)
+        return path
+
+class Workspace:
+    def __init__(self, root=WORKSPACE_DIR, processed_dir=PROCESSED_AUDIO_DIR,
+                 quota_bytes=PROCESSED_AUDIO_QUOTA):
+        self.root = Path(root)
+        self.processed_dir = Path(processed_dir)
+        self.quota_bytes = quota_bytes
+        # Processed audio of jobs still running; never swept by enforce_quota
+        self._active = set()
+        self._running = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def job(self, job_id=None, keep=KEEP_PROCESSED_AUDIO):
+        """Creates a unique job directory and cleans it up on success or failure
+
+        With keep=True processed audio survives the job (e.g. to feed a cache)
+        and the processed directory is trimmed back under its quota.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        job_dir = self.root / job_id
+        job_dir.mkdir(parents=True, exist_ok=False)
+        self.processed_dir.mkdir(parents=True, exist_ok=True)
+
+        job = Job(job_id, job_dir, self)
+        with self._lock:
+            self._running.add(job_id)
+        succeeded = False
+        try:
+            yield job
+            succeeded = True
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            with self._lock:
+                self._active.difference_update(str(path) for path in job.artifacts)
+                self._running.discard(job_id)
+            if keep and succeeded:
+                self.enforce_quota()
+            else:
+                for path in job.artifacts:
+                    self._remove(path)
+
+    def touch(self, path):
+        """Marks kept audio as recently used when a cache reuses it
+
+        Recency is tracked through mtime because atime is unreliable on
+        relatime/noatime mounts.
+        """
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def enforce_quota(self):
+        """Deletes least recently used processed audio until under quota
+
+        Audio belonging to jobs that are still running counts towards the
+        quota but is never deleted.
+        """
+        with self._lock:
+            active = set(self._active)
+
+        entries = []
+        total = 0
+        for entry in os.scandir(self.processed_dir):
+            if not entry.is_file() or not entry.name.endswith(".wav"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            total += stat.st_size
+            if entry.path not in active:
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        removed = []
+        for _, size, path in entries:
+            if total <= self.quota_bytes:
+                break
+            if self._remove(path):
+                removed.append(path)
+            total -= size
+        return removed
+
+    def _activate(self, path):
+        with self._lock:
+            self._active.add(str(path))
+
+    def cleanup_stale(self, max_age=STALE_JOB_AGE, keep=KEEP_PROCESSED_AUDIO):
+        """Removes job directories and processed audio left behind by crashed processes
+
+        Kept audio is trimmed by quota; otherwise processed audio whose job
+        directory is gone is removed once it is older than max_age.
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            running = set(self._running)
+            active = set(self._active)
+        removed = []
+        if self.root.exists():
+            for entry in os.scandir(self.root):
+                if entry.name in running:
+                    continue
+                try:
+                    if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                        removed.append(entry.path)
+                except FileNotFoundError:
+                    continue
+
+        if not self.processed_dir.exists():
+            return removed
+        if keep:
+            return removed + self.enforce_quota()
+
+        for entry in os.scandir(self.processed_dir):
+            if not entry.name.startswith("processed_") or not entry.name.endswith(".wav"):
+                continue
+            # processed_{stem}_{job_id}.wav
+            job_id = entry.name[:-len(".wav")].rsplit("_", 1)[-1]
+            if entry.path in active or (self.root / job_id).exists():
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff and self._remove(entry.path):
+                    removed.append(entry.path)
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+_workspace = None
+_workspace_lock = threading.Lock()
+
+def get_workspace():
+    """Process-wide workspace, so running jobs are protected across every request path"""
+    global _workspace
+    with _workspace_lock:
+        if _workspace is None:
+            _workspace = Workspace()
+        return _workspace